@@ -0,0 +1,100 @@
+"""Export/import of a large profile: time and peak Python memory.
+
+Seeds one synthetic user with ``--tasks`` tasks and ``--completions``
+completions, streams GET /export, then POSTs the file to /import for a second
+user. With --trace-memory the peak Python allocation of each step is measured
+with tracemalloc (which slows everything down, so time and memory are best
+taken from separate runs); with streaming it stays flat as the row counts grow.
+
+Usage (from main/backend), SQLite by default:
+    python benchmarks/bench_export.py --tasks 100000 --completions 100000
+    python benchmarks/bench_export.py --tasks 100000 --completions 100000 --trace-memory
+Set DATABASE_URL to run against a local PostgreSQL database instead.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure(label, func, trace_memory):
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    line = f"{label:<8} {elapsed:>8.2f}s"
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak {peak / 1024 / 1024:>7.1f} MiB"
+    print(line)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--completions", type=int, default=100_000)
+    parser.add_argument("--trace-memory", action="store_true", help="measure peak memory with tracemalloc")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_export.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app import Task, TaskCompletion, User, create_app, db
+
+    app = create_app("production")
+    with app.app_context():
+        db.create_all()
+        source = User(username="export", email="export@example.com", password="-")
+        target = User(username="import", email="import@example.com", password="-", reminders_enabled=False)
+        db.session.add_all([source, target])
+        db.session.flush()
+        source_id, target_id = source.id, target.id
+
+        rows = [{"title": f"Task {n}", "description": "", "user_id": source_id} for n in range(args.tasks)]
+        db.session.bulk_insert_mappings(Task, rows, return_defaults=True)
+        task_ids = [row["id"] for row in rows]
+        # Spread completions over consecutive days, one per task per day
+        start = date.today() - timedelta(days=args.completions // max(len(task_ids), 1) + 1)
+        db.session.bulk_insert_mappings(TaskCompletion, [
+            {"user_id": source_id, "task_id": task_ids[n % len(task_ids)], "day": start + timedelta(days=n // len(task_ids))}
+            for n in range(args.completions)
+        ])
+        db.session.commit()
+        del rows
+
+    print(f"{args.tasks} tasks, {args.completions} completions on {app.config['SQLALCHEMY_DATABASE_URI'].split(':')[0]}")
+    export_path = os.path.join(tempfile.mkdtemp(), "export.ndjson")
+    client = app.test_client()
+
+    def export():
+        with client.session_transaction() as session:
+            session["user_id"] = source_id
+        response = client.get("/export", buffered=False)
+        with open(export_path, "wb") as file:
+            for chunk in response.response:
+                file.write(chunk if isinstance(chunk, bytes) else chunk.encode())
+        response.close()
+
+    def import_():
+        with client.session_transaction() as session:
+            session["user_id"] = target_id
+        with open(export_path, "rb") as file:
+            response = client.post("/import", data=file, content_type="application/x-ndjson")
+        return response.get_json()
+
+    measure("export", export, args.trace_memory)
+    print(f"{'':<8} {os.path.getsize(export_path) / 1024 / 1024:>8.1f} MiB written")
+    print(f"{'':<8} {measure('import', import_, args.trace_memory)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Login throughput versus hashing pool size.
+
+Simulates a login burst: ``--concurrency`` request threads each check a
+password through ``PasswordHasher`` until ``--requests`` logins have been
+served. The "inline" row is the old behaviour (hashing on the request thread).
+
+Usage (from main/backend):
+    python benchmarks/bench_login.py --workers 1 2 4 8 --requests 200
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hashing import HasherBusy, PasswordHasher  # noqa: E402
+
+
+def run(hasher, password_hash, requests, concurrency):
+    rejected = 0
+    lock = threading.Lock()
+
+    def login(_):
+        nonlocal rejected
+        try:
+            assert hasher.verify(password_hash, "correct horse battery staple")
+        except HasherBusy:
+            with lock:
+                rejected += 1
+
+    # Warm the pool so process start-up is not counted
+    hasher.verify(password_hash, "correct horse battery staple")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(login, range(requests)))
+    elapsed = time.perf_counter() - started
+    return (requests - rejected) / elapsed, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="simultaneous login requests")
+    parser.add_argument("--method", default="pbkdf2:sha256")
+    args = parser.parse_args()
+
+    password_hash = PasswordHasher(method=args.method, workers=0).hash("correct horse battery staple")
+
+    print(f"{args.requests} logins, {args.concurrency} concurrent, method {args.method}, {os.cpu_count()} CPUs")
+    print(f"{'hash workers':>12} {'logins/s':>10} {'rejected (503)':>15}")
+
+    # Queue sized to the burst so every request is served and only throughput is compared
+    inline = PasswordHasher(method=args.method, workers=0, queue_size=args.concurrency)
+    throughput, rejected = run(inline, password_hash, args.requests, args.concurrency)
+    print(f"{'inline':>12} {throughput:>10.1f} {rejected:>15}")
+
+    for workers in args.workers:
+        hasher = PasswordHasher(method=args.method, workers=workers, queue_size=args.concurrency)
+        try:
+            throughput, rejected = run(hasher, password_hash, args.requests, args.concurrency)
+        finally:
+            hasher.shutdown()
+        print(f"{workers:>12} {throughput:>10.1f} {rejected:>15}")
+
+
+if __name__ == "__main__":
+    main()
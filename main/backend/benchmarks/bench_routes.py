@@ -0,0 +1,103 @@
+"""pytest-benchmark suite for the auth and task routes.
+
+Runs against in-memory SQLite (see conftest.py), so it needs no services.
+Writes go to their own seeded user so they don't change what the read
+benchmarks measure. From main/backend:
+
+    pip install pytest pytest-benchmark
+    python -m pytest benchmarks/bench_routes.py --benchmark-storage=benchmarks/baselines
+
+Record a new baseline with --benchmark-save=baseline, and fail a run that
+got more than 25% slower than the saved one with:
+
+    python -m pytest benchmarks/bench_routes.py --benchmark-storage=benchmarks/baselines \
+        --benchmark-compare --benchmark-compare-fail=min:25%
+
+The minimum is compared because it is the least affected by a busy machine.
+Baselines are kept per platform and Python version, so record them on the
+machine that runs the comparison.
+"""
+import itertools
+
+from conftest import SEED_TASKS_PER_USER
+
+READ_USER, ADD_USER, UPDATE_USER, DELETE_USER = 1, 2, 3, 4
+
+
+def test_register(benchmark, client):
+    numbers = itertools.count()
+
+    def register():
+        number = next(numbers)
+        return client.post(
+            "/register", json={"username": f"bench{number}", "email": f"bench{number}@example.com", "password": "password"}
+        )
+
+    assert benchmark(register).status_code == 201
+
+
+def test_login(benchmark, client):
+    response = benchmark(client.post, "/login", json={"email": "user1@example.com", "password": "password"})
+    assert response.status_code == 200
+
+
+def test_check_session(benchmark, login):
+    client = login(READ_USER)
+    assert benchmark(client.get, "/check-session").json["user_id"] == READ_USER
+
+
+def test_get_tasks_anonymous(benchmark, client):
+    assert benchmark(client.get, "/tasks").status_code == 200
+
+
+def test_get_tasks(benchmark, login):
+    client = login(READ_USER)
+    response = benchmark(client.get, "/tasks")
+    assert len(response.json) > SEED_TASKS_PER_USER
+
+
+def test_get_tasks_page(benchmark, login):
+    client = login(READ_USER)
+    response = benchmark(client.get, "/tasks?limit=50")
+    assert len(response.json) == 50
+
+
+def test_get_tasks_not_modified(benchmark, login):
+    client = login(READ_USER)
+    etag = client.get("/tasks").headers["ETag"]
+    assert benchmark(client.get, "/tasks", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_get_task_history(benchmark, login):
+    client = login(READ_USER)
+    assert benchmark(client.get, "/tasks/history?days=30").status_code == 200
+
+
+def test_add_task(benchmark, login):
+    client = login(ADD_USER)
+    response = benchmark(client.post, "/tasks", json={"title": "Benchmark", "due_date": "08:30"})
+    assert response.status_code == 200
+
+
+def test_update_task(benchmark, login):
+    client = login(UPDATE_USER)
+    task_id = client.get("/tasks").json[-1]["id"]
+    values = itertools.cycle([True, False])
+
+    def toggle():
+        return client.put(f"/tasks/{task_id}", json={"completed": next(values)})
+
+    assert benchmark(toggle).status_code == 200
+
+
+def test_delete_task(benchmark, login):
+    client = login(DELETE_USER)
+
+    def add_task():
+        return (client.post("/tasks", json={"title": "To delete"}).json["id"],), {}
+
+    def delete(task_id):
+        return client.delete(f"/tasks/{task_id}")
+
+    response = benchmark.pedantic(delete, setup=add_task, rounds=200)
+    assert response.status_code == 200
@@ -0,0 +1,108 @@
+"""Task list serialization: the previous jsonify path against serializers.json_response.
+
+For each list size the task rows are read once from SQLite, then both paths
+turn them into a response body the way GET /tasks does (merge in the default
+tasks, apply today's completion state, encode). The database is not part of
+the timing. Body sizes are shown uncompressed and with the compression the
+client would get.
+
+Usage (from main/backend):
+    python benchmarks/bench_serialize.py
+    python benchmarks/bench_serialize.py --sizes 10 1000 50000 --repeat 20
+Install orjson (and brotli) to compare against the standard library fallback.
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+from datetime import time as time_of_day
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def previous_serialize_task(row):
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "due_date": row.due_date.isoformat(timespec="minutes") if row.due_date else None,
+        "completed": row.completed,
+    }
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 50_000])
+    parser.add_argument("--repeat", type=int, default=10, help="runs per measurement, the best one is shown")
+    args = parser.parse_args()
+
+    import serializers
+    from app import DEFAULT_TASKS, TASK_COLUMNS, Task, User, create_app, db, get_default_tasks
+    from flask import jsonify
+
+    app = create_app("testing")
+    print(f"orjson: {'yes' if serializers.orjson else 'no'}, brotli: {'yes' if serializers.brotli else 'no'}")
+    print(f"{'tasks':>7} {'previous ms':>12} {'new ms':>8} {'speedup':>8} {'raw KiB':>8} {'gzip KiB':>9} {'br KiB':>7}")
+
+    for size in args.sizes:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add_all(Task(**task) for task in DEFAULT_TASKS)
+            user = User(username="bench", email="bench@example.com", password="-")
+            db.session.add(user)
+            db.session.flush()
+            db.session.bulk_insert_mappings(Task, [
+                {"title": f"Task {n}", "description": "Synthetic task", "due_date": time_of_day(n % 24, n % 60),
+                 "completed": False, "user_id": user.id}
+                for n in range(size)
+            ])
+            db.session.commit()
+            rows = db.session.query(*TASK_COLUMNS).filter(Task.user_id == user.id).order_by(Task.id).all()
+            completed_ids = {row.id for row in rows[::3]}
+            default_tasks = get_default_tasks()["tasks"]
+
+        def previous():
+            own_tasks = [previous_serialize_task(row) for row in rows]
+            tasks = list(heapq.merge(default_tasks, own_tasks, key=lambda task: task["id"]))
+            tasks = [{**task, "completed": task["id"] in completed_ids} for task in tasks]
+            return jsonify(tasks).get_data()
+
+        def new():
+            own_tasks = serializers.serialize_tasks(rows, completed_ids)
+            tasks = [{**task, "completed": task["id"] in completed_ids} for task in default_tasks]
+            tasks = list(heapq.merge(tasks, own_tasks, key=lambda task: task["id"]))
+            return serializers.json_response(tasks).get_data()
+
+        with app.test_request_context("/tasks"):
+            assert serializers.loads(previous()) == serializers.loads(new())
+            previous_seconds = best_of(args.repeat, previous)
+            new_seconds = best_of(args.repeat, new)
+            raw = serializers.dumps(serializers.loads(new()))
+
+        sizes = [len(raw) / 1024]
+        for encoding in ("gzip", "br"):
+            if encoding == "br" and serializers.brotli is None:
+                sizes.append(float("nan"))
+                continue
+            with app.test_request_context("/tasks", headers={"Accept-Encoding": encoding}):
+                sizes.append(len(serializers.json_response(serializers.loads(raw)).get_data()) / 1024)
+
+        print(
+            f"{size:>7} {previous_seconds * 1000:>12.2f} {new_seconds * 1000:>8.2f} "
+            f"{previous_seconds / new_seconds:>7.1f}x {sizes[0]:>8.1f} {sizes[1]:>9.1f} {sizes[2]:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Cold start time and per-worker memory of the production entry point.
+
+Cold start runs ``python -X importtime -c "import wsgi"`` in fresh processes
+and reports the wall time, the import time and the slowest imports made by
+app.py. Worker memory starts gunicorn with gunicorn.conf.py, with and
+without preloading the app, and reads RSS, PSS (shared pages split between
+the processes sharing them) and USS (pages only that process uses) of every
+worker from /proc, so that part needs Linux and gunicorn.
+
+Usage (from main/backend), against a throwaway SQLite database by default:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --workers 4 --skip-workers
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    """(module, depth, cumulative microseconds) for every line of -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), depth, int(cumulative)))
+    return imports
+
+
+def cold_start(env, runs, top):
+    wall_times, import_times, slowest = [], [], {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import wsgi"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        wall_times.append(time.perf_counter() - started)
+
+        imports = parse_importtime(result.stderr)
+        import_times.append(dict((name, cumulative) for name, depth, cumulative in imports if depth == 0)["wsgi"])
+        # Direct imports of app.py are one level below it
+        app_index = next(index for index, (name, depth, _) in enumerate(imports) if name == "app" and depth == 1)
+        start = app_index
+        while start > 0 and imports[start - 1][1] > 1:
+            start -= 1
+        for name, depth, cumulative in imports[start:app_index]:
+            if depth == 2:
+                slowest.setdefault(name, []).append(cumulative)
+
+    print(f"Cold start ({runs} runs, median): {statistics.median(wall_times) * 1000:.0f} ms wall, "
+          f"{statistics.median(import_times) / 1000:.0f} ms importing wsgi")
+    print("Slowest imports made by app.py:")
+    ranked = sorted(((statistics.median(times), name) for name, times in slowest.items()), reverse=True)
+    for cumulative, name in ranked[:top]:
+        print(f"  {name:<32} {cumulative / 1000:>7.1f} ms")
+
+
+def memory_kib(pid):
+    """RSS, PSS and USS of a process in KiB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as smaps:
+        for line in smaps:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields["Rss"], fields["Pss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as handle:
+        return [int(child) for child in handle.read().split()]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def worker_memory(env, workers, preload, settle):
+    port = free_port()
+    env = {**env, "BIND": f"127.0.0.1:{port}", "WEB_CONCURRENCY": str(workers),
+           "GUNICORN_PRELOAD": "1" if preload else "0", "GUNICORN_MAX_REQUESTS": "0"}
+    command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"] + (["--preload"] if preload else [])
+    started = time.perf_counter()
+    master = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        # Ready once every worker is up and one of them has answered a request
+        while True:
+            if master.poll() is not None:
+                raise RuntimeError("gunicorn exited, run it by hand to see why")
+            try:
+                if len(children(master.pid)) == workers:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/check-session", timeout=1).read()
+                    break
+            except OSError:
+                pass
+            time.sleep(0.05)
+        ready = time.perf_counter() - started
+        # Let every worker finish booting before reading its memory
+        time.sleep(settle)
+
+        _, master_pss, _ = memory_kib(master.pid)
+        samples = [memory_kib(pid) for pid in children(master.pid)]
+    finally:
+        master.terminate()
+        master.wait()
+
+    rss, pss, uss = (statistics.mean(values) / 1024 for values in zip(*samples))
+    total_pss = (master_pss + sum(sample[1] for sample in samples)) / 1024
+    label = "preload" if preload else "no preload"
+    print(f"{label:<11} ready {ready:>5.2f}s  per worker: RSS {rss:>6.1f} MiB  PSS {pss:>6.1f} MiB  "
+          f"USS {uss:>6.1f} MiB  total PSS {total_pss:>6.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to time")
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn workers")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to wait before reading worker memory")
+    parser.add_argument("--skip-workers", action="store_true", help="only measure the cold start")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_startup.db"))
+    env.setdefault("SECRET_KEY", "benchmark")
+
+    cold_start(env, args.runs, args.top)
+    if not args.skip_workers:
+        print(f"gunicorn with {args.workers} workers:")
+        for preload in (False, True):
+            worker_memory(env, args.workers, preload, args.settle)
+
+
+if __name__ == "__main__":
+    main()
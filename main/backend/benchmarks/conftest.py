@@ -0,0 +1,50 @@
+"""Fixtures for the route benchmarks.
+
+The app runs on in-memory SQLite (the testing config), its schema is built by
+running the migrations and it is seeded with synthetic users, so no database
+server is needed. Every seeded user has the password "password".
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_migrate import upgrade  # noqa: E402
+
+from app import create_app, db, init_migrations, password_hasher, seed_database  # noqa: E402
+
+SEED_USERS = 20
+SEED_TASKS_PER_USER = 200
+SEED_HISTORY_DAYS = 30
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app("testing")
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+        seed_database(SEED_USERS, SEED_TASKS_PER_USER, SEED_HISTORY_DAYS)
+        db.session.commit()
+    yield app
+    password_hasher.shutdown()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(app):
+    """Return a client logged in as seeded user ``number``."""
+
+    def login(number):
+        client = app.test_client()
+        response = client.post("/login", json={"email": f"user{number}@example.com", "password": "password"})
+        assert response.status_code == 200
+        return client
+
+    return login
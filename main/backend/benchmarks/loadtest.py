@@ -0,0 +1,150 @@
+"""Load test for the login, task list and task update flows.
+
+Each virtual user logs in, then loops over GET /tasks and PUT /tasks/<id>,
+logging in again every ``--login-every`` iterations. At the end requests/sec,
+p50 and p99 latency are reported per flow. Only the standard library is used.
+
+All virtual users share one IP, so start the server with RATE_LIMIT_ENABLED=0
+(--serve does this) or the login flow mostly measures 429 responses.
+
+Against a running server (seed it first, users are registered on the fly):
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000 --users 20 --duration 30
+
+Self-contained run: serve the app in-process on a fresh SQLite database
+(set DATABASE_URL to test against a local PostgreSQL instead):
+    python benchmarks/loadtest.py --serve --users 20 --duration 30
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def serve(host, port):
+    """Start the app on a background thread and return its base URL."""
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "loadtest.db")
+    os.environ.setdefault("SECRET_KEY", "loadtest")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    sys.path.insert(0, BACKEND_DIR)
+
+    from werkzeug.serving import make_server
+    from app import DEFAULT_TASKS, Task, create_app, db
+
+    app = create_app("production")
+    with app.app_context():
+        db.create_all()
+        if not Task.query.filter_by(user_id=None).first():
+            db.session.add_all(Task(**task) for task in DEFAULT_TASKS)
+            db.session.commit()
+
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://{host}:{server.server_port}"
+
+
+class VirtualUser:
+    def __init__(self, base_url, number, results, lock):
+        self.base_url = base_url
+        self.email = f"loadtest{number}@example.com"
+        self.results = results
+        self.lock = lock
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+    def request(self, flow, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload).encode()
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        req.add_header("Content-Type", "application/json")
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                data = response.read()
+                ok = True
+        except urllib.error.HTTPError as error:
+            data = error.read()
+            ok = False
+        except OSError:
+            data = b""
+            ok = False
+        elapsed = time.perf_counter() - started
+        if flow:
+            with self.lock:
+                self.results[flow].append((elapsed, ok))
+        return ok, data
+
+    def register(self):
+        # 400 just means the user exists from an earlier run
+        self.request(None, "POST", "/register", {"username": self.email, "email": self.email, "password": "loadtest"})
+
+    def run(self, deadline, login_every):
+        iteration = 0
+        task_ids = []
+        completed = False
+        while time.monotonic() < deadline:
+            if iteration % login_every == 0:
+                self.request("POST /login", "POST", "/login", {"email": self.email, "password": "loadtest"})
+            ok, data = self.request("GET /tasks", "GET", "/tasks")
+            if ok:
+                task_ids = [task["id"] for task in json.loads(data)] or task_ids
+            if task_ids:
+                task_id = task_ids[iteration % len(task_ids)]
+                self.request("PUT /tasks/<id>", "PUT", f"/tasks/{task_id}", {"completed": completed})
+                completed = not completed
+            iteration += 1
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--serve", action="store_true", help="run the app in-process instead of using --url")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--login-every", type=int, default=10, help="log in again every N iterations")
+    args = parser.parse_args()
+
+    base_url = serve("127.0.0.1", 0) if args.serve else args.url.rstrip("/")
+    results = defaultdict(list)
+    lock = threading.Lock()
+    users = [VirtualUser(base_url, number, results, lock) for number in range(args.users)]
+    for user in users:
+        user.register()
+
+    deadline = time.monotonic() + args.duration
+    threads = [threading.Thread(target=user.run, args=(deadline, args.login_every)) for user in users]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    print(f"{base_url}: {args.users} users for {elapsed:.1f}s")
+    print(f"{'flow':<16} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for flow in ("POST /login", "GET /tasks", "PUT /tasks/<id>"):
+        samples = results.get(flow, [])
+        if not samples:
+            continue
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, ok in samples if not ok)
+        print(
+            f"{flow:<16} {len(samples):>9} {errors:>7} {len(samples) / elapsed:>8.1f} "
+            f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Small caching helpers used by the API.
+
+``TTLCache`` is an in-process LRU with per-entry expiry. ``VersionedCache``
+puts one in front of a shared backend (a plain dict by default, Redis when
+configured) and namespaces every key with a version number, so invalidating
+is a single counter bump that every worker sees.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize=128, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, maxsize=None, ttl=None):
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if ttl is not None:
+            self.ttl = ttl
+        self.clear()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DictBackend:
+    """In-process stand-in for a shared cache server (single worker, tests)."""
+
+    def __init__(self):
+        self._cache = TTLCache(maxsize=1024)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl):
+        self._cache.set(key, value, ttl)
+
+    def get_counter(self, key):
+        return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisBackend:
+    """Shared backend for multi-worker deployments. Values are stored as JSON."""
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis  # Optional dependency, only needed when a Redis URL is configured
+
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key):
+        raw = self.client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, json.dumps(value), ex=max(int(ttl), 1))
+
+    def get_counter(self, key):
+        raw = self.client.get(key)
+        return 0 if raw is None else int(raw)
+
+    def incr(self, key):
+        return self.client.incr(key)
+
+
+def create_backend(url=None):
+    if not url:
+        return DictBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend.from_url(url)
+    raise ValueError(f"Unsupported cache backend URL: {url}")
+
+
+class VersionedCache:
+    """Two-level cache (local LRU, then shared backend) with version-based invalidation.
+
+    The current version lives in the backend under ``<namespace>:version``.
+    Values are stored under ``<namespace>:<version>:<key>``, so bumping the
+    version makes every previously cached value unreachable at once.
+    """
+
+    def __init__(self, namespace, backend=None, ttl=300, local_ttl=None, maxsize=128):
+        self.namespace = namespace
+        self.backend = backend if backend is not None else DictBackend()
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl if local_ttl is None else local_ttl)
+
+    def configure(self, backend=None, ttl=None):
+        if backend is not None:
+            self.backend = backend
+        if ttl is not None:
+            self.ttl = ttl
+            self.local.ttl = ttl
+        self.local.clear()
+
+    @property
+    def version(self):
+        return self.backend.get_counter(f"{self.namespace}:version")
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for ``key``, calling ``loader()`` on a miss."""
+        version = self.version
+        local_key = (version, key)
+        value = self.local.get(local_key)
+        if value is not None:
+            return value
+
+        shared_key = f"{self.namespace}:{version}:{key}"
+        value = self.backend.get(shared_key)
+        if value is None:
+            value = loader()
+            self.backend.set(shared_key, value, self.ttl)
+        self.local.set(local_key, value)
+        return value
+
+    def invalidate(self):
+        """Drop every cached value in this namespace, in all workers."""
+        self.backend.incr(f"{self.namespace}:version")
+        self.local.clear()
@@ -0,0 +1,44 @@
+# Gunicorn settings for production.
+# Run from main/backend with:  gunicorn -c gunicorn.conf.py
+# Every setting can be overridden from the environment.
+import multiprocessing
+import os
+
+wsgi_app = "wsgi:app"
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# The app splits its password hashing budget (one process per core by default) between the workers.
+# Every worker keeps at least one, so with more workers than cores each worker hashes one password at a time.
+raw_env = ["APP_ENV=production", f"WEB_CONCURRENCY={workers}"]
+# Threads let a worker keep serving while another request waits on the database
+# or the password hashing pool. Keep threads <= DB_POOL_SIZE + DB_MAX_OVERFLOW.
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Import the app once in the master and fork the workers from it. Workers start
+# faster and share the memory holding the imported code. GUNICORN_PRELOAD=0 loads
+# the app in every worker instead, e.g. to pick up code changes with a HUP reload.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1").lower() in ("1", "true", "yes", "on")
+
+# Recycle workers now and then to keep memory in check
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # A preloaded app's connection pool was created in the master. Forked workers
+    # must open their own connections rather than share the master's sockets.
+    if server.cfg.preload_app:
+        from app import db
+        from wsgi import app
+
+        with app.app_context():
+            db.engine.dispose(close=False)
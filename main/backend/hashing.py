@@ -0,0 +1,138 @@
+"""Password hashing that runs outside the request worker.
+
+pbkdf2 is deliberately slow, so hashing and checking passwords is handed to a
+small process pool. The number of in-flight hashes is bounded: when every slot
+is taken ``HasherBusy`` is raised straight away, and the API turns that into a
+503 with Retry-After instead of letting requests pile up behind the pool.
+
+Every server process has its own pool, so the pool is sized from a per-host
+budget (see ``config.default_hash_workers``) rather than per process.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+# The pool is started from a threaded server worker, where forking can deadlock
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def hash_parameters(method):
+    """Split a method ("pbkdf2:sha256") or stored prefix ("pbkdf2:sha256:1000000") into (algorithm, cost).
+
+    Missing parameters get werkzeug's defaults. ``cost`` is a tuple where a
+    higher value in any position means a slower, stronger hash.
+    """
+    name, *args = method.split(":")
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}", (iterations,)
+    if name == "scrypt":
+        n, r, p = map(int, args) if args else (2**15, 8, 1)
+        return "scrypt", (n, r, p)
+    raise ValueError(f"Invalid hash method {method!r}")
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing pool is saturated."""
+
+    def __init__(self, retry_after):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    def __init__(self, method="pbkdf2:sha256", salt_length=16, workers=2, queue_size=8,
+                 timeout=None, retry_after=1):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+
+    def init_app(self, app):
+        self.shutdown()
+        self.method = app.config.get("PASSWORD_HASH_METHOD", self.method)
+        self.salt_length = app.config.get("PASSWORD_HASH_SALT_LENGTH", self.salt_length)
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", self.workers)
+        self.queue_size = app.config.get("PASSWORD_HASH_QUEUE_SIZE", self.queue_size)
+        self.timeout = app.config.get("PASSWORD_HASH_TIMEOUT", self.timeout)
+        self.retry_after = app.config.get("PASSWORD_HASH_RETRY_AFTER", self.retry_after)
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1) + self.queue_size)
+
+    def _get_pool(self):
+        # Created on first use so that forked server workers each get their own pool
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context(START_METHOD)
+                    )
+        return self._pool
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusy(self.retry_after)
+
+        # workers = 0 hashes inline, which is handy for tests and the dev server
+        if self.workers == 0:
+            try:
+                return func(*args)
+            finally:
+                self._slots.release()
+
+        pool = self._get_pool()
+        try:
+            future = pool.submit(func, *args)
+        except RuntimeError:
+            # The pool is broken or was shut down by another thread
+            self._slots.release()
+            self._discard_pool(pool)
+            raise HasherBusy(self.retry_after)
+        # The slot stays taken until the job is done, even if we stop waiting for it
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HasherBusy(self.retry_after)
+        except BrokenProcessPool:
+            # A pool process died (e.g. OOM killed). Start a fresh pool on the next call.
+            self._discard_pool(pool)
+            raise HasherBusy(self.retry_after)
+
+    def _discard_pool(self, pool):
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the stored hash uses another algorithm, or a lower cost, than the configured method.
+
+        Hashes stronger than the configured method are left alone.
+        """
+        try:
+            algorithm, cost = hash_parameters(password_hash.split("$", 1)[0])
+        except ValueError:
+            return True
+        wanted_algorithm, wanted_cost = hash_parameters(self.method)
+        return algorithm != wanted_algorithm or any(have < want for have, want in zip(cost, wanted_cost))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -0,0 +1,165 @@
+"""Opt-in request timing and SQL query instrumentation.
+
+Enable with METRICS_ENABLED. For every request this records the latency per
+route, the number of SQL queries and the time spent in them, and adds a
+Server-Timing header so the numbers show up in the browser dev tools. A
+statement that runs many times in one request (the classic N+1, e.g. touching
+the lazy ``Task.user`` backref in a loop) is logged and counted.
+
+Totals are exposed in the Prometheus text format at /metrics. They are kept
+per process, so scrape every worker (or run a single worker) to get the
+whole picture.
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+
+
+def format_labels(labels):
+    return ",".join(f'{name}="{value}"' for name, value in labels)
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.n_plus_one_threshold = 5
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter()
+            self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+            self.queries = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))
+            self.sql_seconds = Counter()
+            self.n_plus_one = Counter()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("METRICS_ENABLED", False)
+        if not self.enabled:
+            return
+        self.n_plus_one_threshold = app.config.get("METRICS_N_PLUS_ONE_THRESHOLD", self.n_plus_one_threshold)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule("/metrics", "metrics", self.render)
+
+        # Engine-wide listeners, registered once per process
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    def _start_request(self):
+        g.request_metrics = {"started": time.perf_counter(), "queries": 0, "sql_seconds": 0.0, "statements": Counter()}
+
+    def _finish_request(self, response):
+        stats = g.pop("request_metrics", None)
+        if stats is None or request.endpoint == "metrics":
+            return response
+
+        elapsed = time.perf_counter() - stats["started"]
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        key = (route, request.method)
+
+        repeated = [statement for statement, count in stats["statements"].items() if count >= self.n_plus_one_threshold]
+        for statement in repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                request.method, route, stats["statements"][statement], " ".join(statement.split())[:200],
+            )
+
+        with self._lock:
+            self.requests[key + (response.status_code,)] += 1
+            self.latency[key].observe(elapsed)
+            self.queries[key].observe(stats["queries"])
+            self.sql_seconds[key] += stats["sql_seconds"]
+            if repeated:
+                self.n_plus_one[key] += 1
+
+        response.headers["Server-Timing"] = (
+            f'app;dur={elapsed * 1000:.1f}, db;dur={stats["sql_seconds"] * 1000:.1f};desc="{stats["queries"]} queries"'
+        )
+        return response
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += ["# HELP http_requests_total Requests served.", "# TYPE http_requests_total counter"]
+            for (route, method, status), count in sorted(self.requests.items()):
+                labels = format_labels((("route", route), ("method", method), ("status", status)))
+                lines.append(f"http_requests_total{{{labels}}} {count}")
+
+            lines += self._render_histograms(
+                "http_request_duration_seconds", "Request latency in seconds.", self.latency
+            )
+            lines += self._render_histograms(
+                "db_queries_per_request", "SQL queries issued per request.", self.queries
+            )
+
+            lines += ["# HELP db_query_seconds_total Time spent in SQL queries.", "# TYPE db_query_seconds_total counter"]
+            for (route, method), seconds in sorted(self.sql_seconds.items()):
+                lines.append(f"db_query_seconds_total{{{format_labels((('route', route), ('method', method)))}}} {seconds:.6f}")
+
+            lines += [
+                "# HELP db_n_plus_one_requests_total Requests that ran the same statement repeatedly.",
+                "# TYPE db_n_plus_one_requests_total counter",
+            ]
+            for (route, method), count in sorted(self.n_plus_one.items()):
+                lines.append(f"db_n_plus_one_requests_total{{{format_labels((('route', route), ('method', method)))}}} {count}")
+
+        return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+    @staticmethod
+    def _render_histograms(name, help_text, histograms):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (route, method), histogram in sorted(histograms.items()):
+            base = (("route", route), ("method", method))
+            for upper, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f"{name}_bucket{{{format_labels(base + (('le', upper),))}}} {count}")
+            lines.append(f"{name}_bucket{{{format_labels(base + (('le', '+Inf'),))}}} {histogram.total}")
+            lines.append(f"{name}_sum{{{format_labels(base)}}} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{{{format_labels(base)}}} {histogram.total}")
+        return lines
+
+
+# The start time lives on the execution context, which is dropped with the statement.
+# conn.info lasts as long as the pooled connection, and after_cursor_execute doesn't
+# run for a statement that raises, so anything kept there would pile up.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = context._query_start_time
+    if not has_request_context():
+        return
+    stats = g.get("request_metrics")
+    if stats is not None:
+        stats["queries"] += 1
+        stats["sql_seconds"] += time.perf_counter() - started
+        stats["statements"][statement] += 1
@@ -0,0 +1,34 @@
+"""add task indexes
+
+Revision ID: 4f1c9a2b7d3e
+Revises: e2b3d25af88c
+Create Date: 2026-10-17 09:12:44.310528
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f1c9a2b7d3e'
+down_revision = 'e2b3d25af88c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_id_completed_id', ['user_id', 'completed', 'id'], unique=False)
+        batch_op.create_index(
+            'ix_task_shared_id',
+            ['id'],
+            unique=False,
+            postgresql_where=sa.text('user_id IS NULL'),
+            sqlite_where=sa.text('user_id IS NULL'),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_shared_id')
+        batch_op.drop_index('ix_task_user_id_completed_id')
@@ -0,0 +1,63 @@
+"""add task sync columns
+
+Revision ID: 5b6d2e8f0c71
+Revises: c3d8e1f4a6b9
+Create Date: 2026-10-17 13:26:50.918344
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b6d2e8f0c71'
+down_revision = 'c3d8e1f4a6b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('task_version', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_task_user_id_version', ['user_id', 'version'], unique=False)
+
+    with op.batch_alter_table('task_completion', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('completed', sa.Boolean(), server_default=sa.true(), nullable=False))
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+        # Reads now filter on completed and version, which the primary key doesn't cover
+        batch_op.create_index(
+            'ix_task_completion_user_id_day_completed', ['user_id', 'day', 'completed', 'task_id'], unique=False
+        )
+        batch_op.create_index(
+            'ix_task_completion_user_id_day_version', ['user_id', 'day', 'version', 'task_id'], unique=False
+        )
+
+
+def downgrade():
+    # Unchecked completions and tombstones have no equivalent in the old schema
+    op.execute(sa.text('DELETE FROM task_completion WHERE completed = false'))
+    op.execute(sa.text('DELETE FROM task_completion WHERE task_id IN (SELECT id FROM task WHERE deleted_at IS NOT NULL)'))
+    op.execute(sa.text('DELETE FROM task WHERE deleted_at IS NOT NULL'))
+
+    with op.batch_alter_table('task_completion', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_completion_user_id_day_version')
+        batch_op.drop_index('ix_task_completion_user_id_day_completed')
+        batch_op.drop_column('version')
+        batch_op.drop_column('completed')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_id_version')
+        batch_op.drop_column('deleted_at')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('task_version')
+    if op.get_bind().dialect.name == 'sqlite':
+        # The batch rebuild can't carry over expression indexes
+        op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=True)
@@ -0,0 +1,101 @@
+"""add reminders and due time
+
+Revision ID: 7c2f4a9e1d58
+Revises: 5b6d2e8f0c71
+Create Date: 2026-10-17 15:02:17.553190
+
+"""
+from datetime import time
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2f4a9e1d58'
+down_revision = '5b6d2e8f0c71'
+branch_labels = None
+depends_on = None
+
+# Only "HH:MM" / "HH:MM:SS" strings survive the conversion, anything else becomes NULL
+VALID_TIME = "'^([01]?[0-9]|2[0-3]):[0-5][0-9](:[0-5][0-9])?$'"
+
+# (title, time as converted, time meant) for the shared default tasks
+DEFAULT_TASK_TIME_FIXES = [
+    ('Recovery', time(1, 0), time(13, 0)),
+    ('Family time', time(1, 30), time(13, 30)),
+    ('Dinner', time(9, 0), time(21, 0)),
+    ('Read', time(10, 0), time(22, 0)),
+    ('Gratitude', time(11, 0), time(23, 0)),
+    ('Sleep', time(12, 0), time(0, 0)),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite has no TIME type, SQLAlchemy stores times as "HH:MM:SS.ffffff" text
+        # (the colon is escaped so it isn't read as a bind parameter)
+        op.execute(
+            "UPDATE task SET due_date = CASE WHEN due_date GLOB '[0-2][0-9]:[0-5][0-9]' "
+            "THEN due_date || '\\:00.000000' ELSE NULL END"
+        )
+    else:
+        with op.batch_alter_table('task', schema=None) as batch_op:
+            batch_op.alter_column('due_date',
+                   existing_type=sa.String(length=120),
+                   type_=sa.Time(),
+                   existing_nullable=True,
+                   postgresql_using=f"CASE WHEN due_date ~ {VALID_TIME} THEN due_date::time END")
+
+    # The shared default tasks were stored as 12-hour times without AM/PM
+    # ("01:00" for Recovery), read them as the afternoon and evening times they are
+    task = sa.table('task', sa.column('title', sa.String), sa.column('due_date', sa.Time), sa.column('user_id', sa.Integer))
+    for title, old_time, new_time in DEFAULT_TASK_TIME_FIXES:
+        op.execute(
+            task.update()
+            .where(task.c.user_id.is_(None), task.c.title == title, task.c.due_date == old_time)
+            .values(due_date=new_time)
+        )
+
+    # Plain ADD COLUMN, a batch rebuild of "user" on SQLite would drop the lower(email) index
+    op.add_column('user', sa.Column('timezone', sa.String(length=64), server_default='UTC', nullable=False))
+    op.add_column('user', sa.Column('reminders_enabled', sa.Boolean(), server_default=sa.true(), nullable=False))
+
+    op.create_table('reminder',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('next_fire_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'task_id', name='uq_reminder_user_id_task_id')
+    )
+    with op.batch_alter_table('reminder', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reminder_next_fire_at'), ['next_fire_at'], unique=False)
+
+    # Existing users get their reminders from: flask reminders sync
+
+
+def downgrade():
+    with op.batch_alter_table('reminder', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reminder_next_fire_at'))
+
+    op.drop_table('reminder')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('reminders_enabled')
+        batch_op.drop_column('timezone')
+    if op.get_bind().dialect.name == 'sqlite':
+        # The batch rebuild can't carry over expression indexes
+        op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=True)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("UPDATE task SET due_date = substr(due_date, 1, 5)")
+    else:
+        with op.batch_alter_table('task', schema=None) as batch_op:
+            batch_op.alter_column('due_date',
+                   existing_type=sa.Time(),
+                   type_=sa.String(length=120),
+                   existing_nullable=True,
+                   postgresql_using="to_char(due_date, 'HH24:MI')")
@@ -0,0 +1,36 @@
+"""add task completion log
+
+Revision ID: 9a7e3c5d1b20
+Revises: 4f1c9a2b7d3e
+Create Date: 2026-10-17 10:41:05.772913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a7e3c5d1b20'
+down_revision = '4f1c9a2b7d3e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_completion',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['task.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'task_id')
+    )
+    with op.batch_alter_table('task_completion', schema=None) as batch_op:
+        batch_op.create_index('ix_task_completion_task_id', ['task_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_completion', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_completion_task_id')
+
+    op.drop_table('task_completion')
@@ -0,0 +1,24 @@
+"""add lower(email) index
+
+Revision ID: c3d8e1f4a6b9
+Revises: 9a7e3c5d1b20
+Create Date: 2026-10-17 11:58:31.204417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d8e1f4a6b9'
+down_revision = '9a7e3c5d1b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_email_lower', table_name='user')
@@ -27,17 +27,33 @@ def upgrade():
     sa.UniqueConstraint('email'),
     sa.UniqueConstraint('username')
     )
+    # The task table predates migrations. Create it on a fresh database
+    # (e.g. in-memory SQLite for tests) so upgrades can start from nothing.
+    if not sa.inspect(op.get_bind()).has_table('task'):
+        op.create_table('task',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=120), nullable=False),
+        sa.Column('description', sa.String(length=200), nullable=True),
+        sa.Column('due_date', sa.String(length=120), nullable=True),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        return
+
     with op.batch_alter_table('task', schema=None) as batch_op:
         batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
-        batch_op.create_foreign_key(None, 'user', ['user_id'], ['id'])
+        # Named as PostgreSQL names it by default, SQLite's batch mode needs a name
+        batch_op.create_foreign_key('task_user_id_fkey', 'user', ['user_id'], ['id'])
 
     # ### end Alembic commands ###
 
 
 def downgrade():
     # ### commands auto generated by Alembic - please adjust! ###
+    # The foreign key was created without a name, dropping the column drops it too
     with op.batch_alter_table('task', schema=None) as batch_op:
-        batch_op.drop_constraint(None, type_='foreignkey')
         batch_op.drop_column('user_id')
 
     op.drop_table('user')
@@ -0,0 +1,98 @@
+"""Daily checklist reminders.
+
+Every (user, task with a due time) pair has a row in the ``reminder`` table
+holding the next time it should fire, in UTC. The dispatcher wakes up every
+few seconds, reads one batch of due reminders in ``next_fire_at`` order (a
+single range scan over that index), hands them to a sender and moves each
+reminder on to its next occurrence.
+
+Senders are pluggable: anything with a ``send(notifications)`` method works.
+``LogSender`` writes to the log and ``StubSender`` keeps what it was given,
+which is handy for tests and local runs.
+"""
+import logging
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+Notification = namedtuple("Notification", ["user_id", "email", "task_id", "title", "fire_at"])
+
+
+def utcnow():
+    """Current time as a naive UTC datetime, the format stored in reminder.next_fire_at."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def next_fire_time(due_time, tz_name, after=None):
+    """Next occurrence of ``due_time`` in ``tz_name`` strictly after ``after`` (naive UTC, default now)."""
+    tz = ZoneInfo(tz_name)
+    after = (after or utcnow()).replace(tzinfo=timezone.utc)
+    local_after = after.astimezone(tz)
+    candidate = datetime.combine(local_after.date(), due_time, tzinfo=tz)
+    if candidate <= local_after:
+        candidate = datetime.combine(local_after.date() + timedelta(days=1), due_time, tzinfo=tz)
+    return candidate.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class LogSender:
+    def send(self, notifications):
+        for notification in notifications:
+            logger.info("Reminder for %s: %s", notification.email, notification.title)
+
+
+class StubSender:
+    """Collects notifications instead of delivering them."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, notifications):
+        self.sent.extend(notifications)
+
+
+senders = {
+    "log": LogSender,
+    "stub": StubSender,
+}
+
+
+class ReminderScheduler:
+    """Runs ``dispatch(sender, batch_size)`` in a loop inside the app context.
+
+    ``dispatch`` handles one batch and returns how many reminders it sent. A
+    full batch means more are waiting, so the next tick starts right away.
+    """
+
+    def __init__(self, app, dispatch, sender, batch_size=500, interval=30):
+        self.app = app
+        self.dispatch = dispatch
+        self.sender = sender
+        self.batch_size = batch_size
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def tick(self):
+        with self.app.app_context():
+            return self.dispatch(self.sender, self.batch_size)
+
+    def run_forever(self):
+        while not self.stopped.is_set():
+            try:
+                sent = self.tick()
+            except Exception:
+                logger.exception("Reminder dispatch failed")
+                sent = 0
+            if sent < self.batch_size:
+                self.stopped.wait(self.interval)
+
+    def start(self):
+        """Run the scheduler on a daemon thread, e.g. next to the dev server."""
+        thread = threading.Thread(target=self.run_forever, name="reminder-scheduler", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.stopped.set()
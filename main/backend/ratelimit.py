@@ -0,0 +1,177 @@
+"""Token bucket rate limiting for the auth routes.
+
+Limits are configured per endpoint in ``RATE_LIMITS``, with separate buckets
+per client IP and per email in the request body, e.g.::
+
+    RATE_LIMITS = {"api.login_user": {"ip": "20/minute", "email": "5/minute"}}
+
+A limit of "5/minute" is a bucket holding up to 5 tokens that refills at
+5 tokens per minute. The check runs in ``before_request``, so a rejected
+request is answered with 429 before any database query or password hash.
+
+Buckets live in process memory by default. Set RATE_LIMIT_STORAGE_URL to a
+Redis URL to share them between workers.
+
+Behind a reverse proxy every request comes from the proxy's address, so the
+per-IP buckets would be shared by all clients. Set PROXY_FIX_X_FOR to the
+number of proxies in front of the app to take the client address from
+X-Forwarded-For instead.
+"""
+import math
+import threading
+import time
+
+from flask import jsonify, request
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_limit(limit):
+    """Turn "5/minute" into (capacity, tokens per second)."""
+    count, _, period = limit.partition("/")
+    period = period.strip().rstrip("s")
+    if period not in PERIODS:
+        raise ValueError(f"Unknown rate limit period in {limit!r}")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period]
+
+
+class MemoryStore:
+    """In-process buckets. Keys are spread over striped locks so unrelated clients don't contend."""
+
+    def __init__(self, stripes=64, max_keys=100_000, prune_interval=60):
+        self._buckets = {}  # key -> (tokens, updated, time the bucket is full again)
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._prune_lock = threading.Lock()
+        self._next_prune = 0.0
+        self.max_keys = max_keys
+        self.prune_interval = prune_interval
+
+    def _lock_for(self, key):
+        return self._locks[hash(key) % len(self._locks)]
+
+    def consume(self, key, capacity, rate, cost=1):
+        """Take ``cost`` tokens from the bucket. Returns (allowed, seconds until allowed)."""
+        now = time.monotonic()
+        with self._lock_for(key):
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed, retry_after = False, (cost - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+
+        # At most one scan per interval, however many distinct keys are arriving
+        if len(self._buckets) > self.max_keys and now >= self._next_prune:
+            self._prune(now)
+        return allowed, retry_after
+
+    def _prune(self, now):
+        if not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_prune = now + self.prune_interval
+            # A bucket that has refilled acts like a missing one, so forgetting it changes nothing
+            for key, (_, _, full_at) in list(self._buckets.items()):
+                if full_at > now:
+                    continue
+                with self._lock_for(key):
+                    # Re-checked under the lock, the bucket may have been used since
+                    bucket = self._buckets.get(key)
+                    if bucket is not None and bucket[2] <= now:
+                        del self._buckets[key]
+        finally:
+            self._prune_lock.release()
+
+
+# Refill and take tokens atomically on the Redis server, using its clock
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisStore:
+    """Buckets shared by every worker through Redis."""
+
+    def __init__(self, client, prefix="ratelimit:"):
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url):
+        import redis  # Optional dependency, only needed when a Redis URL is configured
+
+        return cls(redis.Redis.from_url(url))
+
+    def consume(self, key, capacity, rate, cost=1):
+        allowed, retry_after = self._script(keys=[self.prefix + key], args=[capacity, rate, cost])
+        return bool(allowed), float(retry_after)
+
+
+def create_store(url=None):
+    if not url:
+        return MemoryStore()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore.from_url(url)
+    raise ValueError(f"Unsupported rate limit storage URL: {url}")
+
+
+class RateLimiter:
+    def __init__(self):
+        self.store = None
+        self.limits = {}
+
+    def init_app(self, app):
+        if not app.config.get("RATE_LIMIT_ENABLED", True):
+            return
+        self.store = create_store(app.config.get("RATE_LIMIT_STORAGE_URL"))
+        self.limits = {
+            endpoint: {scope: parse_limit(limit) for scope, limit in scopes.items()}
+            for endpoint, scopes in app.config.get("RATE_LIMITS", {}).items()
+        }
+        app.before_request(self.check)
+
+    def keys_for(self, scopes):
+        """Bucket keys for the current request, one per configured scope."""
+        if "ip" in scopes:
+            yield "ip", f"ip:{request.remote_addr}"
+        if "email" in scopes:
+            data = request.get_json(silent=True)
+            email = data.get("email") if isinstance(data, dict) else None
+            if isinstance(email, str) and email:
+                yield "email", f"email:{email.strip().lower()}"
+
+    def check(self):
+        scopes = self.limits.get(request.endpoint)
+        if not scopes:
+            return None
+
+        for scope, key in self.keys_for(scopes):
+            capacity, rate = scopes[scope]
+            allowed, retry_after = self.store.consume(f"{request.endpoint}:{key}", capacity, rate)
+            if not allowed:
+                response = jsonify({"error": "Too many requests, please try again later"})
+                response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                return response, 429
+        return None
@@ -0,0 +1,140 @@
+"""JSON encoding for API responses.
+
+Payloads are built straight from projected column tuples (``serialize_tasks``,
+``serialize_user``) and encoded with orjson when it is installed, falling back
+to the standard library encoder. ``json_response`` compresses large bodies
+with brotli or gzip when the client accepts it.
+
+Bodies that are the same for every client, like the shared default tasks, can
+be wrapped in ``EncodedBody`` once and reused: the JSON bytes and each
+compressed variant are then produced only once per version.
+"""
+import functools
+import gzip
+import json
+import threading
+
+from flask import Response, current_app, request
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, the standard library encoder is used without it
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, gzip is offered without it
+    brotli = None
+
+
+def dumps(value):
+    """Encode ``value`` as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=1440)  # One entry per minute of the day
+def format_due_time(value):
+    return value.isoformat(timespec="minutes")
+
+
+def serialize_task(row, completed=None):
+    """Task fields from a Task or a row with the same column names.
+
+    ``completed`` overrides the stored value, e.g. with today's state from the completion log.
+    """
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "due_date": format_due_time(row.due_date) if row.due_date else None,
+        "completed": row.completed if completed is None else completed,
+    }
+
+
+def serialize_tasks(rows, completed_ids=None):
+    """Task fields for rows of (id, title, description, due_date, completed) columns.
+
+    Rows are unpacked as plain tuples, which is several times faster than
+    attribute access on SQLAlchemy rows. With ``completed_ids`` a task is
+    completed exactly when its id is in the set.
+    """
+    return [
+        {
+            "id": task_id,
+            "title": title,
+            "description": description,
+            "due_date": format_due_time(due_date) if due_date else None,
+            "completed": completed if completed_ids is None else task_id in completed_ids,
+        }
+        for task_id, title, description, due_date, completed in rows
+    ]
+
+
+def serialize_user(row):
+    """User fields from a row of (id, username, email, timezone, reminders_enabled) columns."""
+    return {
+        "id": row.id,
+        "username": row.username,
+        "email": row.email,
+        "timezone": row.timezone,
+        "reminders_enabled": row.reminders_enabled,
+    }
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=current_app.config.get("COMPRESS_BROTLI_QUALITY", 4))
+    return gzip.compress(data, compresslevel=current_app.config.get("COMPRESS_GZIP_LEVEL", 6))
+
+
+def accepted_encoding():
+    """Best content coding the client accepts, or None when compression is off."""
+    if not current_app.config.get("COMPRESS_ENABLED", True):
+        return None
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def choose_encoding(size):
+    """Best content coding the client accepts for a body of ``size`` bytes, or None."""
+    if size < current_app.config.get("COMPRESS_MIN_SIZE", 1024):
+        return None
+    return accepted_encoding()
+
+
+class EncodedBody:
+    """JSON bytes encoded once, with compressed variants made on first use."""
+
+    def __init__(self, value):
+        self.data = dumps(value)
+        self._compressed = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        if encoding is None:
+            return self.data
+        with self._lock:
+            if encoding not in self._compressed:
+                self._compressed[encoding] = compress(self.data, encoding)
+            return self._compressed[encoding]
+
+
+def json_response(payload, status=200):
+    """JSON response for ``payload`` (any JSON value or an EncodedBody), compressed when worthwhile."""
+    if not isinstance(payload, EncodedBody):
+        payload = EncodedBody(payload)
+    encoding = choose_encoding(len(payload.data))
+
+    response = Response(payload.encoded(encoding), status=status, mimetype="application/json")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
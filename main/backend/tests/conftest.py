@@ -0,0 +1,84 @@
+"""Fixtures for the behaviour tests.
+
+Like the benchmarks, the tests run on in-memory SQLite (the testing config)
+with the schema built by the migrations. A few synthetic users are seeded,
+each with the password "password"; tests that write register their own user.
+"""
+import contextlib
+import itertools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_migrate import upgrade  # noqa: E402
+
+from app import create_app, db, init_migrations, password_hasher, seed_database  # noqa: E402
+
+SEED_USERS = 2
+SEED_TASKS_PER_USER = 5
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app("testing")
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+        seed_database(SEED_USERS, SEED_TASKS_PER_USER)
+        db.session.commit()
+    yield app
+    password_hasher.shutdown()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(app):
+    """Return a client logged in as seeded user ``number``."""
+
+    def login(number):
+        client = app.test_client()
+        response = client.post("/login", json={"email": f"user{number}@example.com", "password": "password"})
+        assert response.status_code == 200
+        return client
+
+    return login
+
+
+@pytest.fixture
+def new_user(app, _user_numbers=itertools.count()):
+    """Return a client logged in as a newly registered user, so tests leave the seeded users alone."""
+    number = next(_user_numbers)
+    client = app.test_client()
+    credentials = {"email": f"test{number}@example.com", "password": "password"}
+    assert client.post("/register", json={"username": f"test{number}", **credentials}).status_code == 201
+    assert client.post("/login", json=credentials).status_code == 200
+    return client
+
+
+@pytest.fixture
+def count_queries(app):
+    """Collect the SQL statements run inside ``with count_queries() as statements: ...``."""
+
+    @contextlib.contextmanager
+    def count_queries():
+        statements = []
+
+        def executed(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        db.event.listen(engine, "before_cursor_execute", executed)
+        try:
+            yield statements
+        finally:
+            db.event.remove(engine, "before_cursor_execute", executed)
+
+    return count_queries
@@ -0,0 +1,37 @@
+"""The shared default tasks are cached, so anonymous checklist loads skip the database."""
+
+
+def default_task(client, task_id):
+    return next(task for task in client.get("/tasks").json if task["id"] == task_id)
+
+
+def test_anonymous_update_is_seen_by_the_next_read(client):
+    task_id = client.get("/tasks").json[0]["id"]
+    completed = default_task(client, task_id)["completed"]
+
+    response = client.put(f"/tasks/{task_id}", json={"completed": not completed})
+    assert response.status_code == 200
+    try:
+        assert default_task(client, task_id)["completed"] is (not completed)
+    finally:
+        client.put(f"/tasks/{task_id}", json={"completed": completed})
+    assert default_task(client, task_id)["completed"] is completed
+
+
+def test_warm_anonymous_read_runs_no_queries(client, count_queries):
+    client.get("/tasks")
+
+    with count_queries() as statements:
+        response = client.get("/tasks")
+    assert response.status_code == 200
+    assert response.json
+    assert statements == []
+
+
+def test_warm_anonymous_revalidation_runs_no_queries(client, count_queries):
+    etag = client.get("/tasks").headers["ETag"]
+
+    with count_queries() as statements:
+        response = client.get("/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert statements == []
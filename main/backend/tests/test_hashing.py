@@ -0,0 +1,105 @@
+"""Password hashing pool: rehash decisions, saturation and recovery."""
+import os
+import threading
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app import password_hasher
+from hashing import HasherBusy, PasswordHasher
+
+
+@pytest.mark.parametrize("stored, method, expected", [
+    ("pbkdf2:sha256:1000000", "pbkdf2:sha256", False),
+    ("pbkdf2:sha256:2000000", "pbkdf2:sha256", False),
+    ("pbkdf2:sha256:600000", "pbkdf2:sha256", True),
+    ("pbkdf2:sha256:1000000", "pbkdf2:sha256:600000", False),
+    ("pbkdf2:sha512:1000000", "pbkdf2:sha256", True),
+    ("scrypt:32768:8:1", "pbkdf2:sha256", True),
+    ("scrypt:32768:8:1", "scrypt", False),
+    ("scrypt:16384:8:1", "scrypt", True),
+    ("plaintext", "pbkdf2:sha256", True),
+])
+def test_needs_rehash_only_for_another_algorithm_or_a_lower_cost(stored, method, expected):
+    assert PasswordHasher(method=method, workers=0).needs_rehash(f"{stored}$salt$hash") is expected
+
+
+def test_default_method_matches_werkzeug():
+    hasher = PasswordHasher(workers=0)
+    assert not hasher.needs_rehash(generate_password_hash("password", "pbkdf2:sha256"))
+
+
+def test_saturated_pool_raises_busy():
+    hasher = PasswordHasher(workers=0, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=hasher._run, args=(slow,))
+    thread.start()
+    try:
+        started.wait(5)
+        with pytest.raises(HasherBusy):
+            hasher._run(time.sleep, 0)
+    finally:
+        release.set()
+        thread.join()
+    hasher._run(time.sleep, 0)
+
+
+def test_slot_is_held_until_a_timed_out_job_finishes():
+    hasher = PasswordHasher(workers=1, queue_size=0, timeout=0.05)
+    try:
+        with pytest.raises(HasherBusy):
+            hasher._run(time.sleep, 0.5)
+        # The job is still running in the pool, so it still counts against the bound
+        hasher.timeout = 5
+        with pytest.raises(HasherBusy):
+            hasher._run(time.sleep, 0)
+
+        time.sleep(0.6)
+        assert hasher._run(time.sleep, 0) is None
+    finally:
+        hasher.shutdown()
+
+
+def test_dead_pool_process_is_replaced():
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    try:
+        with pytest.raises(HasherBusy):
+            hasher._run(os._exit, 1)
+        assert hasher.verify(generate_password_hash("password", "pbkdf2:sha256:1000"), "password")
+    finally:
+        hasher.shutdown()
+
+
+@pytest.fixture
+def saturated_hasher(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(password_hasher, "_slots", slots)
+
+
+def test_saturated_login_is_503_with_retry_after(client, saturated_hasher):
+    response = client.post("/login", json={"email": "user1@example.com", "password": "password"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(password_hasher.retry_after)
+
+
+def test_saturated_register_is_503_with_retry_after(client, saturated_hasher):
+    response = client.post("/register", json={"username": "busy", "email": "busy@example.com", "password": "password"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(password_hasher.retry_after)
+
+
+def test_login_succeeds_when_the_rehash_is_busy(client, monkeypatch):
+    def busy(password):
+        raise HasherBusy(password_hasher.retry_after)
+
+    monkeypatch.setattr(password_hasher, "needs_rehash", lambda password_hash: True)
+    monkeypatch.setattr(password_hasher, "hash", busy)
+    response = client.post("/login", json={"email": "user2@example.com", "password": "password"})
+    assert response.status_code == 200
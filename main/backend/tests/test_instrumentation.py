@@ -0,0 +1,36 @@
+"""Request timing and SQL query counts (METRICS_ENABLED)."""
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db, init_migrations, metrics
+
+
+@pytest.fixture(scope="module")
+def metrics_app():
+    # A separate app and in-memory database with the instrumentation switched on
+    app = create_app("testing")
+    app.config["METRICS_ENABLED"] = True
+    metrics.init_app(app)
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+    yield app
+    metrics.enabled = False
+
+
+def test_requests_report_their_queries(metrics_app):
+    response = metrics_app.test_client().get("/tasks")
+    assert response.status_code == 200
+    assert "queries" in response.headers["Server-Timing"]
+    assert 'route="/tasks",method="GET",status="200"' in metrics_app.test_client().get("/metrics").text
+
+
+def test_failed_statements_leave_nothing_on_the_connection(metrics_app):
+    with metrics_app.app_context(), db.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql("SELECT * FROM no_such_table")
+            connection.rollback()
+        connection.exec_driver_sql("SELECT 1")
+        assert not connection.info.get("query_started")
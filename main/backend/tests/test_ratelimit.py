@@ -0,0 +1,88 @@
+"""Rate limits on the auth routes.
+
+The testing config turns the limiter off, so these tests run their own app
+with it on and small limits. Each test uses its own client addresses and
+emails, so the buckets don't carry over between tests.
+"""
+import pytest
+from flask_migrate import upgrade
+
+from app import create_app, db, init_migrations, password_hasher
+from ratelimit import RateLimiter
+
+IP_LIMIT = 3
+EMAIL_LIMIT = 2
+
+
+@pytest.fixture(scope="module")
+def limited_app():
+    app = create_app("testing")
+    app.config.update(
+        RATE_LIMIT_ENABLED=True,
+        RATE_LIMITS={"api.login_user": {"ip": f"{IP_LIMIT}/minute", "email": f"{EMAIL_LIMIT}/minute"}},
+    )
+    RateLimiter().init_app(app)
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+    return app
+
+
+def login(app, email, ip):
+    client = app.test_client()
+    return client.post(
+        "/login", json={"email": email, "password": "password"}, environ_base={"REMOTE_ADDR": ip}
+    )
+
+
+def test_ip_bucket_limits_one_client(limited_app):
+    for number in range(IP_LIMIT):
+        assert login(limited_app, f"ip{number}@example.com", "10.0.0.1").status_code == 401
+    assert login(limited_app, "ip-next@example.com", "10.0.0.1").status_code == 429
+    # Other clients have buckets of their own
+    assert login(limited_app, "ip-next@example.com", "10.0.0.2").status_code == 401
+
+
+def test_email_bucket_limits_one_account_across_addresses(limited_app):
+    for number in range(EMAIL_LIMIT):
+        assert login(limited_app, "target@example.com", f"10.0.1.{number}").status_code == 401
+    # Case doesn't give an attacker a fresh bucket
+    assert login(limited_app, "Target@Example.com", "10.0.1.100").status_code == 429
+    assert login(limited_app, "other@example.com", "10.0.1.101").status_code == 401
+
+
+def test_rejection_says_when_to_retry(limited_app):
+    for _ in range(EMAIL_LIMIT):
+        login(limited_app, "retry@example.com", "10.0.2.1")
+    response = login(limited_app, "retry@example.com", "10.0.2.1")
+    assert response.status_code == 429
+    # One token comes back every 30 seconds at 2/minute
+    assert 1 <= int(response.headers["Retry-After"]) <= 30
+
+
+def test_rejection_comes_before_queries_and_hashing(limited_app, monkeypatch):
+    credentials = {"email": "limited@example.com", "password": "password"}
+    client = limited_app.test_client()
+    assert client.post("/register", json={"username": "limited", **credentials}).status_code == 201
+    for _ in range(EMAIL_LIMIT):
+        assert login(limited_app, credentials["email"], "10.0.3.1").status_code == 200
+
+    def no_hashing(*args):
+        raise AssertionError("password hashed by a rejected request")
+
+    monkeypatch.setattr(password_hasher, "verify", no_hashing)
+    monkeypatch.setattr(password_hasher, "hash", no_hashing)
+    statements = []
+
+    def executed(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with limited_app.app_context():
+        engine = db.engine
+    db.event.listen(engine, "before_cursor_execute", executed)
+    try:
+        response = login(limited_app, credentials["email"], "10.0.3.1")
+    finally:
+        db.event.remove(engine, "before_cursor_execute", executed)
+    assert response.status_code == 429
+    assert statements == []
@@ -0,0 +1,84 @@
+"""Reminder scheduling and dispatch, with the testing config's stub sender."""
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from app import DEFAULT_TASKS, Reminder, db, dispatch_due_reminders
+from notifications import next_fire_time, senders
+
+
+@pytest.fixture
+def user_reminders(app):
+    """Return the (task id -> next_fire_at) reminders of the user behind ``client``."""
+
+    def user_reminders(client):
+        user_id = client.get("/check-session").get_json()["user_id"]
+        with app.app_context():
+            return dict(db.session.query(Reminder.task_id, Reminder.next_fire_at).filter_by(user_id=user_id))
+
+    return user_reminders
+
+
+def add_task(client, due_date="08:00"):
+    response = client.post("/tasks", json={"title": "Stretch", "due_date": due_date})
+    assert response.status_code == 200
+    return response.get_json()["id"]
+
+
+def test_due_reminders_are_sent_and_advanced(app, new_user, user_reminders):
+    task_id = add_task(new_user)
+    fire_at = user_reminders(new_user)[task_id]
+    now = fire_at + timedelta(minutes=1)
+
+    sender = senders[app.config["REMINDER_SENDER"]]()
+    with app.app_context():
+        # Large enough for every due reminder in the shared test database
+        dispatch_due_reminders(sender, batch_size=10_000, now=now)
+
+    sent = [notification for notification in sender.sent if notification.task_id == task_id]
+    assert [(notification.title, notification.fire_at) for notification in sent] == [("Stretch", fire_at)]
+    assert user_reminders(new_user)[task_id] == fire_at + timedelta(days=1)
+
+
+def test_disabling_reminders_deletes_them(new_user, user_reminders):
+    task_id = add_task(new_user)
+    assert task_id in user_reminders(new_user)
+
+    assert new_user.put("/settings", json={"reminders_enabled": False}).status_code == 200
+    assert user_reminders(new_user) == {}
+    assert add_task(new_user) not in user_reminders(new_user)
+
+    assert new_user.put("/settings", json={"reminders_enabled": True}).status_code == 200
+    assert task_id in user_reminders(new_user)
+
+
+def test_deleting_a_task_removes_its_reminder(new_user, user_reminders):
+    task_id = add_task(new_user)
+    assert new_user.delete(f"/tasks/{task_id}").status_code == 200
+    assert task_id not in user_reminders(new_user)
+
+
+def test_bulk_delete_removes_reminders(new_user, user_reminders):
+    kept, *deleted = [add_task(new_user) for _ in range(3)]
+    assert new_user.delete("/tasks/bulk", json={"ids": deleted}).status_code == 200
+    reminders = user_reminders(new_user)
+    assert kept in reminders
+    assert not reminders.keys() & set(deleted)
+
+
+def test_timezone_change_reschedules_reminders(new_user, user_reminders):
+    task_id = add_task(new_user)
+    assert user_reminders(new_user)[task_id].time() == time(8, 0)
+
+    assert new_user.put("/settings", json={"timezone": "Asia/Tokyo"}).status_code == 200
+    reminders = user_reminders(new_user)
+    # 08:00 in Tokyo (UTC+9, no daylight saving) is 23:00 UTC
+    assert reminders[task_id].time() == time(23, 0)
+    assert len(reminders) == len(DEFAULT_TASKS) + 1
+
+
+def test_default_tasks_fire_in_checklist_order():
+    # The checklist starts at "Wake up", so every later task fires later that day
+    start = datetime(2026, 1, 1, 6, 0)
+    fire_times = [next_fire_time(task["due_date"], "UTC", after=start) for task in DEFAULT_TASKS]
+    assert fire_times == sorted(fire_times)
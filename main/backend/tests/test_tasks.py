@@ -0,0 +1,263 @@
+"""Behaviour tests for the task routes: revalidation, delta sync, bulk writes and import.
+
+Every test registers its own user (see the new_user fixture), so the seeded
+data the benchmarks read is left unchanged.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import ProfileImporter
+
+
+def add_task(client, title="Task"):
+    response = client.post("/tasks", json={"title": title})
+    assert response.status_code == 200
+    return response.json["id"]
+
+
+def sync_version(client):
+    return client.get("/tasks").headers["X-Sync-Version"]
+
+
+def changes_since(client, since):
+    response = client.get("/tasks", query_string={"since": since})
+    assert response.status_code == 200
+    return response.json
+
+
+def task_ids(client):
+    return {task["id"] for task in client.get("/tasks").json}
+
+
+# ------------------------ ETag revalidation ------------------------
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_unchanged_list_is_not_modified(new_user, encoding):
+    headers = {"Accept-Encoding": encoding}
+    response = new_user.get("/tasks", headers=headers)
+    etag = response.headers["ETag"]
+
+    not_modified = new_user.get("/tasks", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b""
+    # A 304 carries the validator the 200 would have sent
+    assert not_modified.headers["ETag"] == etag
+
+
+def test_change_invalidates_etag(new_user):
+    etag = new_user.get("/tasks").headers["ETag"]
+    add_task(new_user)
+
+    response = new_user.get("/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+# ------------------------ Delta sync ------------------------
+
+def test_since_reports_toggled_tasks(new_user):
+    own_id = add_task(new_user)
+    default_id = min(task_ids(new_user))
+    since = sync_version(new_user)
+
+    new_user.put(f"/tasks/{own_id}", json={"completed": True})
+    new_user.put(f"/tasks/{default_id}", json={"completed": True})
+
+    changes = changes_since(new_user, since)
+    assert changes["reset"] is False
+    assert {task["id"]: task["completed"] for task in changes["changed"]} == {default_id: True, own_id: True}
+    assert changes["deleted"] == []
+
+    # Unchecking is a change too
+    since = changes["version"]
+    new_user.put(f"/tasks/{own_id}", json={"completed": False})
+    changes = changes_since(new_user, since)
+    assert [(task["id"], task["completed"]) for task in changes["changed"]] == [(own_id, False)]
+
+
+def test_since_reports_deleted_tasks(new_user):
+    task_id = add_task(new_user)
+    since = sync_version(new_user)
+
+    assert new_user.delete(f"/tasks/{task_id}").status_code == 200
+
+    changes = changes_since(new_user, since)
+    assert changes["changed"] == []
+    assert changes["deleted"] == [task_id]
+    assert task_id not in task_ids(new_user)
+
+
+def test_since_without_changes_is_empty(new_user):
+    add_task(new_user)
+    changes = changes_since(new_user, sync_version(new_user))
+    assert changes == {"version": changes["version"], "reset": False, "changed": [], "deleted": []}
+
+
+def test_since_from_an_earlier_day_resets(new_user):
+    task_id = add_task(new_user)
+    day, versions = sync_version(new_user).split(".", 1)
+    yesterday = date.fromisoformat(day) - timedelta(days=1)
+
+    changes = changes_since(new_user, f"{yesterday.isoformat()}.{versions}")
+    assert changes["reset"] is True
+    assert {task["id"] for task in changes["changed"]} == task_ids(new_user)
+    assert task_id in {task["id"] for task in changes["changed"]}
+
+
+def test_malformed_since_is_rejected(new_user):
+    assert new_user.get("/tasks", query_string={"since": "yesterday"}).status_code == 400
+
+
+def test_bulk_writes_advance_the_sync_version(new_user):
+    since = sync_version(new_user)
+    created = new_user.post("/tasks/bulk", json={"tasks": [{"title": "One"}, {"title": "Two"}]}).json["created"]
+    first, second = (item["id"] for item in created)
+
+    changes = changes_since(new_user, since)
+    assert [task["id"] for task in changes["changed"]] == [first, second]
+
+    since = changes["version"]
+    new_user.patch("/tasks/bulk", json={"tasks": [{"id": first, "completed": True}]})
+    new_user.delete("/tasks/bulk", json={"ids": [second]})
+
+    changes = changes_since(new_user, since)
+    assert [(task["id"], task["completed"]) for task in changes["changed"]] == [(first, True)]
+    assert changes["deleted"] == [second]
+
+
+def test_import_advances_the_sync_version(new_user):
+    since = sync_version(new_user)
+    response = new_user.post("/import", data=b'{"type": "task", "id": 1, "title": "Imported"}\n')
+    assert response.status_code == 201
+
+    changes = changes_since(new_user, since)
+    assert [task["title"] for task in changes["changed"]] == ["Imported"]
+
+
+# ------------------------ Bulk routes ------------------------
+
+def test_bulk_create_reports_errors_per_item(new_user):
+    response = new_user.post("/tasks/bulk", json={"tasks": [
+        {"title": "Fine", "due_date": "08:00"},
+        {"description": "No title"},
+        {"title": "Bad time", "due_date": "8 o'clock"},
+    ]})
+    assert response.status_code == 201
+    assert [item["index"] for item in response.json["created"]] == [0]
+    assert [error["index"] for error in response.json["errors"]] == [1, 2]
+
+
+def test_bulk_create_with_no_valid_items_is_rejected(new_user):
+    response = new_user.post("/tasks/bulk", json={"tasks": [{"description": "No title"}]})
+    assert response.status_code == 400
+    assert response.json["created"] == []
+
+
+def test_bulk_update_applies_the_last_value_per_id(new_user):
+    task_id = add_task(new_user)
+    response = new_user.patch("/tasks/bulk", json={"tasks": [
+        {"id": task_id, "completed": False},
+        {"id": task_id, "completed": True},
+    ]})
+    assert response.json == {"updated": [task_id], "errors": []}
+
+    completed = {task["id"]: task["completed"] for task in new_user.get("/tasks").json}
+    assert completed[task_id] is True
+
+
+def test_bulk_update_reports_errors_per_item(new_user, login):
+    others_task = max(task_ids(login(1)))
+    task_id = add_task(new_user)
+
+    response = new_user.patch("/tasks/bulk", json={"tasks": [
+        {"id": task_id, "completed": True},
+        {"id": others_task, "completed": True},
+        {"id": "1", "completed": True},
+    ]})
+    assert response.json["updated"] == [task_id]
+    assert [(error["index"], error.get("id")) for error in response.json["errors"]] == [(1, others_task), (2, None)]
+
+
+def test_bulk_routes_reject_boolean_ids(new_user):
+    # JSON true is a Python bool, which is an int, and would otherwise mean task 1
+    shared_id = min(task_ids(new_user))
+    assert shared_id == 1
+
+    response = new_user.patch("/tasks/bulk", json={"tasks": [{"id": True, "completed": True}]})
+    assert response.json["updated"] == []
+    assert [error["index"] for error in response.json["errors"]] == [0]
+    completed = {task["id"]: task["completed"] for task in new_user.get("/tasks").json}
+    assert completed[shared_id] is False
+
+    response = new_user.delete("/tasks/bulk", json={"ids": [True]})
+    assert response.json == {"deleted": [], "errors": [{"index": 0, "error": "Task ids must be integers"}]}
+
+
+def test_bulk_delete_reports_errors_per_item(new_user):
+    task_id = add_task(new_user)
+    default_id = min(task_ids(new_user))
+
+    response = new_user.delete("/tasks/bulk", json={"ids": [task_id, default_id, "x"]})
+    assert response.json["deleted"] == [task_id]
+    assert [error["index"] for error in response.json["errors"]] == [1, 2]
+    assert default_id in task_ids(new_user)
+
+
+def test_bulk_routes_need_a_list(new_user):
+    assert new_user.post("/tasks/bulk", json={"tasks": []}).status_code == 400
+    assert new_user.patch("/tasks/bulk", json={"tasks": "all"}).status_code == 400
+    assert new_user.delete("/tasks/bulk", json={}).status_code == 400
+
+
+# ------------------------ Export / import ------------------------
+
+def test_export_imports_into_another_account(app, new_user):
+    task_id = add_task(new_user, "Exported")
+    new_user.put(f"/tasks/{task_id}", json={"completed": True})
+    new_user.put(f"/tasks/{min(task_ids(new_user))}", json={"completed": True})
+    export = new_user.get("/export").data
+
+    client = app.test_client()
+    client.post("/register", json={"username": "importer", "email": "importer@example.com", "password": "password"})
+    client.post("/login", json={"email": "importer@example.com", "password": "password"})
+    response = client.post("/import", data=export)
+    assert response.status_code == 201
+    assert response.json == {"tasks": 1, "completions": 2, "skipped": 0}
+
+
+@pytest.mark.parametrize("body", [
+    b'{"type": "task", "id": [1], "title": "List id"}',
+    b'{"type": "task", "id": 1, "title": {"a": 1}}',
+    b'{"type": "task", "id": 1, "title": "' + b"x" * 121 + b'"}',
+    b'{"type": "task", "id": 1, "title": "Fine", "description": 5}',
+    b'{"type": "task", "id": 1, "title": "Fine", "due_date": "noon"}',
+    b'{"type": "task", "id": 1, "title": "Fine"}\n{"type": "completion", "task_id": [3], "day": "2025-01-01"}',
+    b'{"type": "completion", "default_task": {"a": 1}, "day": "2025-01-01"}',
+    b'{"type": "completion", "task_id": 1, "day": "January"}',
+    b'{"type": "profile", "timezone": "Mars/Olympus"}',
+    b'{"type": "mystery"}',
+    b'["not", "an", "object"]',
+    b'{not json',
+])
+def test_import_rejects_malformed_records(new_user, body):
+    before = task_ids(new_user)
+    response = new_user.post("/import", data=body)
+    assert response.status_code == 400
+    assert response.json["error"].startswith("Line ")
+    # The whole file is one transaction, so nothing was imported
+    assert task_ids(new_user) == before
+
+
+
+def test_import_database_failure_is_a_server_error(app, new_user, monkeypatch):
+    def finish(self):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(ProfileImporter, "finish", finish)
+    monkeypatch.setitem(app.config, "PROPAGATE_EXCEPTIONS", False)
+    before = task_ids(new_user)
+    response = new_user.post("/import", data=b'{"type": "task", "id": 1, "title": "Imported"}\n')
+    assert response.status_code == 500
+    assert task_ids(new_user) == before